@@ -2,11 +2,81 @@
 """
 Redis Cache implementation
 """
+import os
 import redis
-import uuid
-from typing import Union, Callable, Optional, Any
+import socket
+import sys
+from typing import Union, Callable, Iterable, List, Optional, Any
 from functools import wraps
 
+# Bound at module scope so key generation is a single syscall + C-level
+# hex encode, skipping uuid.UUID construction and formatting
+_urandom = os.urandom
+
+# Bound once so get_str doesn't allocate a fresh closure per call;
+# the unbound C method decodes UTF-8 by default
+_decode_utf8 = bytes.decode
+
+try:
+    import orjson
+
+    def _serialize(obj: Any) -> str:
+        """
+        Serialize a call argument/result with orjson's C encoder,
+        truncated to 256 characters; falls back to repr for types JSON
+        can't express (e.g. raw bytes)
+        """
+        try:
+            return orjson.dumps(obj).decode('utf-8')[:256]
+        except TypeError:
+            return str(obj)[:256]
+except ImportError:
+    def _serialize(obj: Any) -> str:
+        """
+        Serialize a call argument/result via repr, truncated to 256
+        characters (orjson not installed)
+        """
+        return str(obj)[:256]
+
+
+# TCP keepalive so NAT/firewall idle drops are detected instead of
+# stalling the first command after a quiet period; redis-py already sets
+# TCP_NODELAY on every connection. socket_timeout bounds a dead server's
+# impact to 2s per command.
+_SOCKET_OPTS = {
+    'socket_keepalive': True,
+    'socket_keepalive_options': {
+        socket.TCP_KEEPIDLE: 60,
+        socket.TCP_KEEPINTVL: 30,
+        socket.TCP_KEEPCNT: 3,
+    },
+    'socket_timeout': 2.0,
+}
+
+# Shared connection pool so every Cache instance reuses the same sockets
+# instead of each creating its own implicit per-client pool
+_POOL = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379)),
+    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)),
+    decode_responses=False,
+    **_SOCKET_OPTS,
+)
+
+# Separate pool with decode_responses=True for text-only reads: the
+# client decodes once during RESP parsing instead of a per-item
+# bytes.decode loop in Python
+_STR_POOL = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379)),
+    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)),
+    decode_responses=True,
+    **_SOCKET_OPTS,
+)
+
+# Dedicated decoded client for history/replay reads
+_redis_str = redis.Redis(connection_pool=_STR_POOL)
+
 
 def replay(method: Callable) -> None:
     """
@@ -15,39 +85,31 @@ def replay(method: Callable) -> None:
     Args:
         method: The method to display call history for
     """
-    # Get the Redis instance from the method's class (assuming it's a Cache method)
-    # We need to access the Redis instance through the method's class
-    redis_instance = method.__self__._redis
-    
-    # Generate keys for count, inputs, and outputs
+    # Use the decoded client so replies come back as str and no per-item
+    # bytes.decode loop is needed below
+    redis_instance = _redis_str
+
+    # Generate keys for count and the history stream
     method_name = method.__qualname__
     count_key = method_name
-    inputs_key = f"{method_name}:inputs"
-    outputs_key = f"{method_name}:outputs"
-    
-    # Get the call count
-    count = redis_instance.get(count_key)
-    if count is None:
-        count = 0
-    else:
-        count = int(count)
-    
-    # Get the inputs and outputs history
-    inputs = redis_instance.lrange(inputs_key, 0, -1)
-    outputs = redis_instance.lrange(outputs_key, 0, -1)
-    
-    # Display the summary
-    print(f"{method_name} was called {count} times:")
+    history_key = f"{method_name}:history"
+
+    # Fetch count and history in a single round-trip
+    pipe = redis_instance.pipeline(transaction=False)
+    pipe.get(count_key)
+    pipe.xrange(history_key, "-", "+")
+    count, history = pipe.execute()
+
+    count = int(count) if count is not None else 0
     
-    # Display each call with its input and output
-    for input_args, output in zip(inputs, outputs):
-        # Decode bytes to string if needed
-        if isinstance(input_args, bytes):
-            input_args = input_args.decode('utf-8')
-        if isinstance(output, bytes):
-            output = output.decode('utf-8')
-        
-        print(f"{method_name}(*{input_args}) -> {output}")
+    # Format the summary and every call line once, then emit with a
+    # single write instead of one print per history entry
+    lines = [f"{method_name} was called {count} times:"]
+    lines.extend(
+        f"{method_name}(*{fields['args']}) -> {fields['out']}"
+        for _, fields in history
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def call_history(method: Callable) -> Callable:
@@ -65,19 +127,33 @@ def call_history(method: Callable) -> Callable:
         """
         Wrapper function that stores input/output history and calls the original method
         """
-        # Create keys for input and output lists
-        input_key = f"{method.__qualname__}:inputs"
-        output_key = f"{method.__qualname__}:outputs"
-        
-        # Store input arguments in Redis list (normalize to string)
-        self._redis.rpush(input_key, str(args))
-        
-        # Execute the original method to get the output
-        output = method(self, *args, **kwargs)
-        
-        # Store output in Redis list
-        self._redis.rpush(output_key, output)
-        
+        # One stream entry holds both sides of a call, so input and
+        # output can never skew apart and one XADD replaces two RPUSHes
+        history_key = f"{method.__qualname__}:history"
+
+        # Batch every Redis command for this call into a single pipeline so
+        # the whole call costs one round-trip instead of one per command
+        pipe = self._redis.pipeline(transaction=False)
+        self._pipeline = pipe
+        try:
+            # Execute the original method to get the output (inner wrappers
+            # and the method itself queue their commands on the pipeline)
+            output = method(self, *args, **kwargs)
+
+            # Queue the call record (serialized and truncated so large
+            # payloads can't bloat the history); maxlen bounds the stream
+            pipe.xadd(
+                history_key,
+                {"args": _serialize(args), "out": _serialize(output)},
+                maxlen=1000,
+                approximate=True,
+            )
+        finally:
+            self._pipeline = None
+
+        # Flush all queued commands in one round-trip
+        pipe.execute()
+
         return output
     return wrapper
 
@@ -99,8 +175,10 @@ def count_calls(method: Callable) -> Callable:
         """
         # Use the method's qualified name as the key
         key = method.__qualname__
-        # Increment the counter in Redis
-        self._redis.incr(key)
+        # Increment the counter, queueing on the active pipeline if one is
+        # open so the INCR rides along in the same round-trip
+        target = getattr(self, '_pipeline', None) or self._redis
+        target.incr(key)
         # Call and return the original method
         return method(self, *args, **kwargs)
     return wrapper
@@ -109,45 +187,131 @@ def count_calls(method: Callable) -> Callable:
 class Cache:
     """Cache class for storing data in Redis"""
     
-    def __init__(self):
-        """Initialize Redis client and flush database"""
-        self._redis = redis.Redis()
-        self._redis.flushdb()
+    def __init__(self, flush: bool = False):
+        """
+        Initialize Redis client on the shared connection pool
+
+        Args:
+            flush: If True, flush the database on startup. Off by default
+                   so instantiating a Cache in one worker does not wipe
+                   state shared with other workers.
+        """
+        self._redis = redis.Redis(connection_pool=_POOL)
+        if flush:
+            self._redis.flushdb()
+        # Pipeline shared with the decorators while a decorated call is
+        # in flight; None when no call is active
+        self._pipeline = None
     
     @call_history
     @count_calls
-    def store(self, data: Union[str, bytes, int, float]) -> str:
+    def store(self, data: Union[str, bytes, int, float],
+              ttl: Optional[int] = None) -> str:
         """
         Store data in Redis with a random key
-        
+
         Args:
             data: The data to store (str, bytes, int, or float)
-            
+            ttl: Optional expiry in seconds; folded into the SET as a
+                 single SET ... EX command rather than a separate EXPIRE
+
         Returns:
             str: The generated key used to store the data
         """
-        key = str(uuid.uuid4())
-        self._redis.set(key, data)
+        # Generate the key up front so the SET can be queued on the
+        # decorators' pipeline and the key returned before the flush
+        key = _urandom(16).hex()
+        target = getattr(self, '_pipeline', None) or self._redis
+        target.set(key, data, ex=ttl)
         return key
     
+    def store_many(self, values: Iterable[Union[str, bytes, int, float]]) -> List[str]:
+        """
+        Store several values in Redis in a single round-trip
+
+        Args:
+            values: The values to store (str, bytes, int, or float each)
+
+        Returns:
+            List[str]: The generated keys, in the same order as the values
+        """
+        values = list(values)
+        if not values:
+            return []
+        # One urandom call for the whole batch, sliced into 32-char keys
+        raw = _urandom(16 * len(values)).hex()
+        keys = [raw[i:i + 32] for i in range(0, len(raw), 32)]
+        # MSET pushes every key in one command / one round-trip
+        self._redis.mset(dict(zip(keys, values)))
+        return keys
+
+    def store_int(self, n: int) -> str:
+        """
+        Store an integer in Redis with a random key
+
+        The value is sent as a plain integer so the server keeps it
+        int-encoded and it stays usable with INCR-family commands.
+
+        Args:
+            n: The integer to store
+
+        Returns:
+            str: The generated key used to store the value
+        """
+        key = _urandom(16).hex()
+        self._redis.set(key, int(n))
+        return key
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        """
+        Increment an integer key and return its new value
+
+        INCRBY replies with a RESP integer, which the client parser
+        returns as an int directly — no Python-side int() parse, unlike
+        reading the value back through get_int.
+
+        Args:
+            key: The key to increment
+            amount: How much to add (default 1)
+
+        Returns:
+            int: The value after the increment
+        """
+        return self._redis.incrby(key, amount)
+
     def get(self, key: str, fn: Optional[Callable] = None) -> Any:
         """
         Get data from Redis and optionally convert it using fn
-        
+
         Args:
             key: The key to retrieve from Redis
             fn: Optional callable to convert the data back to desired format
-            
+
         Returns:
             The data from Redis, optionally converted using fn
         """
+        # Fast path: no conversion requested, hand back the raw reply
+        # without the fn/None branching below
+        if fn is None:
+            return self._redis.get(key)
+        return self._get_with_fn(key, fn)
+
+    def _get_with_fn(self, key: str, fn: Callable) -> Any:
+        """
+        Get data from Redis and convert it using fn
+
+        Args:
+            key: The key to retrieve from Redis
+            fn: Callable to convert the data back to desired format
+
+        Returns:
+            The converted data, or None if the key doesn't exist
+        """
         data = self._redis.get(key)
         if data is None:
             return None
-        if fn is not None:
-            return fn(data)
-        return data
-    
+        return fn(data)
+
     def get_str(self, key: str) -> Optional[str]:
         """
         Get data from Redis and convert to string
@@ -158,7 +322,7 @@ class Cache:
         Returns:
             The data as a UTF-8 decoded string, or None if key doesn't exist
         """
-        return self.get(key, fn=lambda d: d.decode("utf-8"))
+        return self._get_with_fn(key, _decode_utf8)
     
     def get_int(self, key: str) -> Optional[int]:
         """
@@ -170,4 +334,4 @@ class Cache:
         Returns:
             The data as an integer, or None if key doesn't exist
         """
-        return self.get(key, fn=int)
\ No newline at end of file
+        return self._get_with_fn(key, int)
\ No newline at end of file
@@ -2,12 +2,69 @@
 """
 Web page caching with Redis
 """
+import asyncio
+import os
 import redis
 import requests
-from typing import Callable
-from functools import wraps
+import socket
+from typing import Callable, List
+from functools import lru_cache, wraps
+
+# TCP keepalive so NAT/firewall idle drops are detected instead of
+# stalling the first command after a quiet period; redis-py already sets
+# TCP_NODELAY on every connection. socket_timeout bounds a dead server's
+# impact to 2s per command.
+_SOCKET_OPTS = {
+    'socket_keepalive': True,
+    'socket_keepalive_options': {
+        socket.TCP_KEEPIDLE: 60,
+        socket.TCP_KEEPINTVL: 30,
+        socket.TCP_KEEPCNT: 3,
+    },
+    'socket_timeout': 2.0,
+}
+
+# Shared connection pool so concurrent workers reuse sockets instead of
+# serializing on a single implicit per-client connection
+_POOL = redis.ConnectionPool(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379)),
+    max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)),
+    decode_responses=True,
+    **_SOCKET_OPTS,
+)
+
+redis_client = redis.Redis(connection_pool=_POOL)
+
+# Server-side GET + INCR in one atomic EVALSHA: one round-trip like the
+# pipeline it replaces, but the count can never skew from the lookup
+# under concurrent hits. register_script caches the SHA after first use.
+_GET_AND_COUNT = redis_client.register_script(
+    "local v = redis.call('GET', KEYS[1]) "
+    "redis.call('INCR', KEYS[2]) "
+    "return v"
+)
+
+# Pooled HTTP session so repeated fetches reuse TCP/TLS connections
+# instead of paying the handshake on every live request
+_SESSION = requests.Session()
+_ADAPTER = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+@lru_cache(maxsize=4096)
+def _keys(url: str) -> tuple:
+    """
+    Build (and memoize) the cache and count keys for a URL
+
+    Args:
+        url: The URL to build keys for
+
+    Returns:
+        Tuple of (cache_key, count_key)
+    """
+    return (f"cache:{url}", f"count:{url}")
 
-redis_client = redis.Redis(decode_responses=True)
 
 def url_access_count(method: Callable) -> Callable:
     """
@@ -25,14 +82,11 @@ def url_access_count(method: Callable) -> Callable:
         Wrapper function that counts URL access and handles caching
         """
 
-        count_key = f"count:{url}"
-        cache_key = f"cache:{url}"
-
-        # Increment access count
-        redis_client.incr(count_key)
+        cache_key, count_key = _keys(url)
 
-        # Check for cached result
-        cached_result = redis_client.get(cache_key)
+        # Atomically fetch the cached page and bump the access count in
+        # one server-side script call
+        cached_result = _GET_AND_COUNT(keys=[cache_key, count_key])
         if cached_result:
             return cached_result
 
@@ -55,40 +109,117 @@ def get_page(url: str) -> str:
     Returns:
         The HTML content of the page
     """
-    response = requests.get(url)
+    response = _SESSION.get(url, timeout=10)
     return response.text
 
 
-def get_page_no_decorator(url: str) -> str:
+# The async clients are created per event loop run (they cannot outlive
+# the loop they were created on) and imported lazily so importing web.py
+# doesn't require aiohttp
+def _async_session():
     """
-    Get HTML content of a URL with caching and access counting (no decorator)
-    
+    Create an aiohttp session for the running event loop
+
+    Returns:
+        An aiohttp.ClientSession with a 10s total timeout
+    """
+    import aiohttp
+
+    return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+
+def _async_redis():
+    """
+    Create an async Redis client for the running event loop
+
+    Returns:
+        A redis.asyncio.Redis client with decoded responses
+    """
+    import redis.asyncio as aioredis
+
+    return aioredis.Redis(
+        host=os.getenv('REDIS_HOST', 'localhost'),
+        port=int(os.getenv('REDIS_PORT', 6379)),
+        max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 100)),
+        decode_responses=True,
+    )
+
+
+async def _fetch_page_async(url: str, session, r) -> str:
+    """
+    Fetch one URL with caching and access counting on the given clients
+
     Args:
         url: The URL to fetch
-        
+        session: An open aiohttp.ClientSession
+        r: A redis.asyncio.Redis client
+
     Returns:
         The HTML content of the page
     """
+    cache_key, count_key = _keys(url)
 
-    count_key = f"count:{url}"
-    cache_key = f"cache:{url}"
-
-    # Increment access count
-    redis_client.incr(count_key)
-
-    # Check for cached result
-    cached_result = redis_client.get(cache_key)
+    # Increment access count and check the cache in one round-trip
+    pipe = r.pipeline(transaction=False)
+    pipe.incr(count_key)
+    pipe.get(cache_key)
+    _, cached_result = await pipe.execute()
     if cached_result:
         return cached_result
 
     # Get fresh result and cache it
-    response = requests.get(url)
-    result = response.text
-    redis_client.setex(cache_key, 10, result)
+    async with session.get(url) as response:
+        result = await response.text()
+    await r.setex(cache_key, 10, result)
 
     return result
 
 
+async def get_page_async(url: str) -> str:
+    """
+    Async version of get_page: caching and access counting without
+    blocking the event loop
+
+    Creates and closes its own clients; prefer get_pages for batches so
+    the clients are shared across fetches.
+
+    Args:
+        url: The URL to fetch
+
+    Returns:
+        The HTML content of the page
+    """
+    async with _async_session() as session:
+        r = _async_redis()
+        try:
+            return await _fetch_page_async(url, session, r)
+        finally:
+            await r.close()
+
+
+def get_pages(urls: List[str]) -> List[str]:
+    """
+    Fetch many URLs concurrently on one event loop
+
+    Args:
+        urls: The URLs to fetch
+
+    Returns:
+        The HTML content of each page, in the same order as urls
+    """
+    async def gather_pages():
+        async with _async_session() as session:
+            r = _async_redis()
+            try:
+                return await asyncio.gather(
+                    *(_fetch_page_async(url, session, r) for url in urls)
+                )
+            finally:
+                await r.close()
+
+    return asyncio.run(gather_pages())
+
+
 def get_url_access_count(url: str) -> int:
     """
     Get the number of times a URL has been accessed
@@ -99,7 +230,7 @@ def get_url_access_count(url: str) -> int:
     Returns:
         The number of times the URL has been accessed
     """
-    count = redis_client.get(f"count:{url}")
+    count = redis_client.get(_keys(url)[1])
     return int(count) if count else 0
 
 
@@ -110,7 +241,7 @@ def clear_url_cache(url: str) -> None:
     Args:
         url: The URL to clear from cache
     """
-    redis_client.delete(f"cache:{url}")
+    redis_client.delete(_keys(url)[0])
 
 
 def clear_all_cache() -> None: